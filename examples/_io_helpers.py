@@ -0,0 +1,99 @@
+"""
+Shared I/O helpers for the example scripts
+
+Fast-path readers (Parquet / calamine) and the "is this output up to date?"
+stamps used by basic_consolidation.py, cross_file_analysis.py and
+sales_dashboard.py. Each script's own directory is on sys.path when it is
+run, so they can simply `from _io_helpers import ...`.
+"""
+
+import json
+import os
+import pandas as pd
+from pathlib import Path
+
+# Optional fast paths: Parquet needs pyarrow, calamine is a Rust .xlsx reader
+try:
+    import pyarrow  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+try:
+    import python_calamine  # noqa: F401
+    # read_excel only accepts engine='calamine' from pandas 2.2 on
+    pandas_version = tuple(int(x) for x in pd.__version__.split('.')[:2])
+    EXCEL_ENGINE = 'calamine' if pandas_version >= (2, 2) else None
+except ImportError:
+    EXCEL_ENGINE = None  # let pandas pick its default (openpyxl)
+
+
+def read_tabular(path):
+    """Read a .parquet, .csv or Excel file into a DataFrame using the fastest reader available"""
+    path = Path(path)
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+    if path.suffix == '.csv':
+        return pd.read_csv(path)
+    return pd.read_excel(path, engine=EXCEL_ENGINE)
+
+
+def save_parquet_copy(df, path):
+    """Write df as a Parquet copy of the file at path, stamped with that file's mtime"""
+    path = Path(path)
+    parquet = path.with_suffix('.parquet')
+    df.to_parquet(parquet, index=False)
+    stat = path.stat()
+    os.utime(parquet, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    return parquet
+
+
+def fastest_source(path):
+    """Return the Parquet copy of a file if it was written from this exact file (see save_parquet_copy)"""
+    path = Path(path)
+    parquet = path.with_suffix('.parquet')
+    # A file replaced since (even by an older one) no longer matches the copy's mtime
+    if HAS_PARQUET and parquet.exists() and parquet.stat().st_mtime_ns == path.stat().st_mtime_ns:
+        return parquet
+    return path
+
+
+def _input_signature(inputs):
+    """[path, mtime, size] of each input file, sorted so discovery order doesn't matter"""
+    return sorted([str(f), f.stat().st_mtime, f.stat().st_size] for f in map(Path, inputs))
+
+
+def _stamp_file(outputs):
+    """Sidecar next to the first output that records what the outputs were built from"""
+    first = Path(outputs[0])
+    return first.with_name(first.name + '.inputs.json')
+
+
+def is_up_to_date(outputs, inputs):
+    """
+    True if every output exists and was last built (see record_inputs) from
+    exactly these input files, none of which has changed since.
+
+    Comparing the recorded file list, not just mtimes, also catches inputs
+    that were removed, added with an old mtime (cp -p, unzip) or swapped for
+    a different set of files.
+    """
+    outputs = [Path(f) for f in outputs]
+    inputs = [Path(f) for f in inputs]
+    stamp = _stamp_file(outputs)
+    if not inputs or not stamp.exists() or not all(f.exists() for f in outputs + inputs):
+        return False
+    try:
+        recorded = json.loads(stamp.read_text())
+    except ValueError:
+        return False
+    return (set(map(str, outputs)) <= set(recorded.get('outputs', []))
+            and recorded.get('inputs') == _input_signature(inputs))
+
+
+def record_inputs(outputs, inputs):
+    """Remember which input files (and which versions of them) the outputs were built from"""
+    _stamp_file(outputs).write_text(json.dumps({
+        'outputs': [str(f) for f in outputs],
+        'inputs': _input_signature(inputs)
+    }, indent=2))
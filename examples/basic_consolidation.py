@@ -9,18 +9,56 @@ This is the most common use case - you receive multiple Excel files
 (monthly exports, regional reports, etc.) and need to combine them into one.
 """
 
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+from _io_helpers import (HAS_PARQUET, fastest_source, is_up_to_date, read_tabular, record_inputs,
+                         save_parquet_copy)
 
-def consolidate_sales_files(file_pattern='sales_*.xlsx', output_file='consolidated_sales.xlsx'):
+
+def ensure_datetime(dates):
+    """Return a date column as datetime64, only parsing it if it isn't one already"""
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    return pd.to_datetime(dates)
+
+
+def sorted_date_range(dates):
+    """Return (first, last) of a date column that is already sorted, or None if it is all empty"""
+    # sort_values puts NaT at the end, so the last valid entry is the maximum
+    last = dates.last_valid_index()
+    if last is None:
+        return None
+    return dates.iloc[0], dates.loc[last]
+
+
+def read_source_file(file):
+    """Read one input file for consolidation. Returns (DataFrame, None) or (None, error)"""
+    try:
+        df = read_tabular(fastest_source(file))
+    except Exception as e:
+        return None, e
+
+    # Add source file column to track origin
+    df['Source_File'] = file.name
+    return df, None
+
+
+def consolidate_sales_files(file_pattern='sales_*.xlsx', output_file='consolidated_sales.xlsx',
+                            write_xlsx=True, force=False):
     """
     Consolidate multiple Excel files matching a pattern into one file.
 
     Args:
         file_pattern: Pattern to match files (e.g., 'sales_*.xlsx')
         output_file: Name of output consolidated file
+        write_xlsx: Also write the (slow) Excel copy of the consolidated data.
+                    A Parquet copy next to output_file is always written when
+                    pyarrow is installed; without it the Excel file is always written.
+        force: Rebuild even if the outputs are newer than every input file
     """
 
     print("=" * 60)
@@ -41,19 +79,30 @@ def consolidate_sales_files(file_pattern='sales_*.xlsx', output_file='consolidat
     for f in files:
         print(f"  - {f.name}")
 
+    # Same input files as the last run, all unchanged -> the outputs on disk are current
+    parquet_file = Path(output_file).with_suffix('.parquet')
+    write_xlsx = write_xlsx or not HAS_PARQUET
+    outputs = ([parquet_file] if HAS_PARQUET else []) + ([output_file] if write_xlsx else [])
+    summary_file = 'consolidation_summary.xlsx'
+    sources = [fastest_source(f) for f in files]
+    if not force and is_up_to_date(outputs + [summary_file], sources):
+        print("\n✓ Outputs are up to date with all input files - nothing to do")
+        print("  (pass force=True to rebuild anyway)")
+        return
+
     # Step 2: Read all files
     print(f"\n[2] Reading all Excel files...")
-    dataframes = []
+    # Files are independent, so read them concurrently; results come back in file order
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(files)))) as executor:
+        results = list(executor.map(read_source_file, files))
 
-    for file in files:
-        try:
-            df = pd.read_excel(file)
-            # Add source file column to track origin
-            df['Source_File'] = file.name
+    dataframes = []
+    for file, (df, error) in zip(files, results):
+        if error is not None:
+            print(f"  ❌ Error reading {file.name}: {error}")
+        else:
             dataframes.append(df)
             print(f"  ✓ {file.name}: {len(df)} rows")
-        except Exception as e:
-            print(f"  ❌ Error reading {file.name}: {e}")
 
     if not dataframes:
         print("❌ No data to consolidate!")
@@ -61,43 +110,60 @@ def consolidate_sales_files(file_pattern='sales_*.xlsx', output_file='consolidat
 
     # Step 3: Combine all DataFrames
     print(f"\n[3] Consolidating data...")
-    consolidated = pd.concat(dataframes, ignore_index=True)
+    consolidated = pd.concat(dataframes, ignore_index=True, sort=False)
+
+    # Repeated text labels (product, region, source file, ...) -> category, so the
+    # date sort and the summary groupbys move small integer codes around instead of
+    # strings. Done after concat: per-file categoricals with different categories
+    # would concatenate back to plain objects.
+    for column in consolidated.select_dtypes(include=['object', 'string']).columns:
+        if consolidated[column].nunique() <= len(consolidated) // 2:
+            consolidated[column] = consolidated[column].astype('category')
     print(f"✓ Total rows: {len(consolidated)}")
 
+    # Optional - Sort by date (this also turns the date range into a first/last lookup)
+    date_range = None
+    if 'Date' in consolidated.columns:
+        consolidated['Date'] = ensure_datetime(consolidated['Date'])
+        consolidated = consolidated.sort_values('Date', ignore_index=True)
+        date_range = sorted_date_range(consolidated['Date'])
+        print("✓ Sorted by date")
+
     # Step 4: Basic data quality checks
     print(f"\n[4] Data Quality Summary:")
     print(f"  - Total records: {len(consolidated)}")
     print(f"  - Columns: {', '.join(consolidated.columns)}")
-    print(f"  - Date range: {consolidated['Date'].min()} to {consolidated['Date'].max()}")
+    if date_range:
+        print(f"  - Date range: {date_range[0]} to {date_range[1]}")
     print(f"  - Missing values: {consolidated.isnull().sum().sum()}")
 
-    # Step 5: Optional - Sort by date
-    if 'Date' in consolidated.columns:
-        consolidated['Date'] = pd.to_datetime(consolidated['Date'])
-        consolidated = consolidated.sort_values('Date')
-        print("✓ Sorted by date")
-
-    # Step 6: Save consolidated file
-    print(f"\n[5] Saving to '{output_file}'...")
-    consolidated.to_excel(output_file, index=False)
+    # Step 6: Save consolidated file - Parquet is a fraction of the cost of .xlsx
+    # for the full dataset; the Excel copy is for people opening it by hand
+    print(f"\n[5] Saving to {' and '.join(str(f) for f in outputs)}...")
+    if HAS_PARQUET:
+        consolidated.to_parquet(parquet_file, index=False)
+    if write_xlsx:
+        consolidated.to_excel(output_file, index=False, engine='xlsxwriter')
     print(f"✓ Saved {len(consolidated)} records")
 
     # Step 7: Generate summary report
     print(f"\n[6] Generating summary...")
-    generate_summary(consolidated, 'consolidation_summary.xlsx')
+    generate_summary(consolidated, summary_file, date_range=date_range)
+    record_inputs(outputs + [summary_file], sources)
 
     print("\n" + "=" * 60)
     print("✓ CONSOLIDATION COMPLETE!")
     print("=" * 60)
     print(f"\nOutput files created:")
-    print(f"  📊 {output_file} - Full consolidated data")
-    print(f"  📈 consolidation_summary.xlsx - Summary report")
+    for f in outputs:
+        print(f"  📊 {f} - Full consolidated data")
+    print(f"  📈 {summary_file} - Summary report")
 
 
 def create_sample_files():
     """Create sample files for demonstration"""
 
-    import random
+    rng = np.random.default_rng()
 
     products = ['Widget A', 'Widget B', 'Gadget Pro', 'Tool Set', 'Parts Kit']
     regions = ['North', 'South', 'East', 'West']
@@ -106,10 +172,10 @@ def create_sample_files():
         data = {
             'Date': pd.date_range(start=f'2024-{["January", "February", "March"].index(month) + 1}-01',
                                   periods=30, freq='D'),
-            'Product': [random.choice(products) for _ in range(30)],
-            'Region': [random.choice(regions) for _ in range(30)],
-            'Units': [random.randint(5, 50) for _ in range(30)],
-            'Price': [round(random.uniform(10, 100), 2) for _ in range(30)]
+            'Product': rng.choice(products, size=30),
+            'Region': rng.choice(regions, size=30),
+            'Units': rng.integers(5, 51, size=30),
+            'Price': rng.uniform(10, 100, size=30).round(2)
         }
         df = pd.DataFrame(data)
         df['Revenue'] = df['Units'] * df['Price']
@@ -118,11 +184,26 @@ def create_sample_files():
         df.to_excel(filename, index=False)
         print(f"  ✓ Created {filename}")
 
+        # Parquet copy for fast re-reads (the .xlsx stays the human-facing file)
+        if HAS_PARQUET:
+            save_parquet_copy(df, filename)
+
 
-def generate_summary(df, output_file):
-    """Generate a summary report from consolidated data"""
+def generate_summary(df, output_file, date_range=None):
+    """
+    Generate a summary report from consolidated data
+
+    Args:
+        df: Consolidated DataFrame
+        output_file: Name of the summary workbook to write
+        date_range: Optional (first, last) dates already known to the caller,
+                    saves re-scanning the Date column
+    """
+
+    if date_range is None and 'Date' in df.columns:
+        date_range = (df['Date'].min(), df['Date'].max())
 
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+    with pd.ExcelWriter(output_file, engine='xlsxwriter') as writer:
 
         # Sheet 1: Overall Summary
         summary_data = {
@@ -138,7 +219,7 @@ def generate_summary(df, output_file):
                 len(df),
                 f"${df['Revenue'].sum():,.2f}" if 'Revenue' in df.columns else 'N/A',
                 f"${df['Revenue'].mean():,.2f}" if 'Revenue' in df.columns else 'N/A',
-                f"{df['Date'].min()} to {df['Date'].max()}" if 'Date' in df.columns else 'N/A',
+                f"{date_range[0]} to {date_range[1]}" if date_range else 'N/A',
                 df['Product'].nunique() if 'Product' in df.columns else 'N/A',
                 df['Region'].nunique() if 'Region' in df.columns else 'N/A'
             ]
@@ -147,7 +228,7 @@ def generate_summary(df, output_file):
 
         # Sheet 2: By Product
         if 'Product' in df.columns and 'Revenue' in df.columns:
-            product_summary = df.groupby('Product').agg({
+            product_summary = df.groupby('Product', observed=True).agg({
                 'Units': 'sum',
                 'Revenue': 'sum'
             }).sort_values('Revenue', ascending=False).reset_index()
@@ -155,7 +236,7 @@ def generate_summary(df, output_file):
 
         # Sheet 3: By Region
         if 'Region' in df.columns and 'Revenue' in df.columns:
-            region_summary = df.groupby('Region').agg({
+            region_summary = df.groupby('Region', observed=True).agg({
                 'Units': 'sum',
                 'Revenue': 'sum'
             }).sort_values('Revenue', ascending=False).reset_index()
@@ -163,8 +244,8 @@ def generate_summary(df, output_file):
 
         # Sheet 4: By Month
         if 'Date' in df.columns and 'Revenue' in df.columns:
-            df['Month'] = pd.to_datetime(df['Date']).dt.to_period('M')
-            monthly_summary = df.groupby('Month').agg({
+            month = ensure_datetime(df['Date']).dt.to_period('M').rename('Month')
+            monthly_summary = df.groupby(month).agg({
                 'Revenue': 'sum',
                 'Units': 'sum'
             }).reset_index()
@@ -183,6 +264,9 @@ def main():
     # Option 2: Custom pattern and output
     # consolidate_sales_files(file_pattern='report_*.xlsx', output_file='my_consolidated_report.xlsx')
 
+    # Option 3: Large datasets - skip the Excel copy, keep only the Parquet file
+    # consolidate_sales_files(write_xlsx=False)
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -13,20 +13,29 @@ Takes raw sales data and creates a multi-sheet dashboard with:
 - Top customers
 """
 
+import numpy as np
+import openpyxl
 import pandas as pd
 import sqlite3
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from _io_helpers import is_up_to_date, record_inputs
+
+# Low-cardinality columns stored as pandas 'category' after loading
+CATEGORICAL_COLUMNS = ('Product', 'Region', 'Sales_Rep', 'Customer')
+
 
 def create_sample_sales_data():
     """Create sample sales data for demonstration"""
 
-    import random
+    rng = np.random.default_rng()
 
     # Generate 3 months of sales data
     start_date = datetime.now() - timedelta(days=90)
-    dates = pd.date_range(start=start_date, periods=500, freq='H')
+    dates = pd.date_range(start=start_date, periods=500, freq='h')
 
     products = ['Widget A', 'Widget B', 'Gadget Pro', 'Tool Set', 'Parts Kit',
                 'Premium Package', 'Starter Kit', 'Deluxe Edition']
@@ -34,22 +43,27 @@ def create_sample_sales_data():
     sales_reps = ['Alice', 'Bob', 'Charlie', 'Diana', 'Edward', 'Fiona']
     customers = [f'Customer_{i:03d}' for i in range(1, 51)]
 
-    data = {
-        'Transaction_ID': [f'TXN{i:06d}' for i in range(1, 501)],
-        'Date': [d.date() for d in dates],
-        'Product': [random.choice(products) for _ in range(500)],
-        'Region': [random.choice(regions) for _ in range(500)],
-        'Sales_Rep': [random.choice(sales_reps) for _ in range(500)],
-        'Customer': [random.choice(customers) for _ in range(500)],
-        'Units': [random.randint(1, 20) for _ in range(500)],
-        'Unit_Price': [round(random.uniform(10, 200), 2) for _ in range(500)],
-        'Discount_%': [random.choice([0, 5, 10, 15, 20]) for _ in range(500)]
-    }
+    # Derived amounts are computed on the raw arrays, then the frame is built once
+    units = rng.integers(1, 21, size=500)
+    unit_price = rng.uniform(10, 200, size=500).round(2)
+    discount_pct = rng.choice([0, 5, 10, 15, 20], size=500)
+    subtotal = units * unit_price
+    discount_amount = subtotal * (discount_pct / 100)
 
-    df = pd.DataFrame(data)
-    df['Subtotal'] = df['Units'] * df['Unit_Price']
-    df['Discount_Amount'] = df['Subtotal'] * (df['Discount_%'] / 100)
-    df['Total_Sale'] = df['Subtotal'] - df['Discount_Amount']
+    df = pd.DataFrame({
+        'Transaction_ID': [f'TXN{i:06d}' for i in range(1, 501)],
+        'Date': dates.normalize(),
+        'Product': rng.choice(products, size=500),
+        'Region': rng.choice(regions, size=500),
+        'Sales_Rep': rng.choice(sales_reps, size=500),
+        'Customer': rng.choice(customers, size=500),
+        'Units': units,
+        'Unit_Price': unit_price,
+        'Discount_%': discount_pct,
+        'Subtotal': subtotal,
+        'Discount_Amount': discount_amount,
+        'Total_Sale': subtotal - discount_amount
+    })
 
     df.to_excel('raw_sales_data.xlsx', index=False)
     print("✓ Created sample raw_sales_data.xlsx")
@@ -61,12 +75,21 @@ def load_sales_data(filename='raw_sales_data.xlsx'):
 
     if not Path(filename).exists():
         print(f"⚠️  {filename} not found. Creating sample data...")
-        return create_sample_sales_data()
+        df = create_sample_sales_data()
+    else:
+        print(f"📂 Loading {filename}...")
+        df = pd.read_excel(filename)
+        # Excel date cells already arrive as datetime64; only parse text dates
+        if not pd.api.types.is_datetime64_any_dtype(df['Date']):
+            df['Date'] = pd.to_datetime(df['Date'])
+        print(f"✓ Loaded {len(df)} transactions")
+
+    # Repeated text values (product, region, ...) -> category codes, so groupby
+    # works on small integers instead of hashing every string
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
 
-    print(f"📂 Loading {filename}...")
-    df = pd.read_excel(filename)
-    df['Date'] = pd.to_datetime(df['Date'])
-    print(f"✓ Loaded {len(df)} transactions")
     return df
 
 
@@ -79,13 +102,16 @@ def generate_executive_summary(df):
     avg_transaction = df['Total_Sale'].mean()
     total_units = df['Units'].sum()
 
-    # Date range
-    date_range = f"{df['Date'].min().strftime('%Y-%m-%d')} to {df['Date'].max().strftime('%Y-%m-%d')}"
+    # Date range (each bound computed once and reused for the growth split)
+    first_date, last_date = df['Date'].min(), df['Date'].max()
+    date_range = f"{first_date.strftime('%Y-%m-%d')} to {last_date.strftime('%Y-%m-%d')}"
 
     # Growth metrics (compare first half vs second half)
-    mid_date = df['Date'].min() + (df['Date'].max() - df['Date'].min()) / 2
-    first_half = df[df['Date'] < mid_date]['Total_Sale'].sum()
-    second_half = df[df['Date'] >= mid_date]['Total_Sale'].sum()
+    mid_date = first_date + (last_date - first_date) / 2
+    # One comparison over the raw arrays; the second half is whatever is left of the total
+    in_first_half = df['Date'].to_numpy() < mid_date.to_datetime64()
+    first_half = np.nansum(df['Total_Sale'].to_numpy()[in_first_half])
+    second_half = total_revenue - first_half
     growth_rate = ((second_half - first_half) / first_half * 100) if first_half > 0 else 0
 
     summary = {
@@ -118,17 +144,28 @@ def generate_executive_summary(df):
     return pd.DataFrame(summary)
 
 
-def analyze_product_performance(df):
-    """Analyze performance by product"""
-
-    product_perf = df.groupby('Product').agg({
-        'Transaction_ID': 'count',
-        'Units': 'sum',
-        'Total_Sale': 'sum',
-        'Discount_Amount': 'sum'
-    }).reset_index()
+def analyze_product_performance(df, conn=None):
+    """Analyze performance by product (aggregated by SQLite when conn is given)"""
+
+    if conn is not None:
+        product_perf = pd.read_sql_query("""
+            SELECT Product,
+                   COUNT(Transaction_ID) AS Transactions,
+                   SUM(Units) AS Units_Sold,
+                   SUM(Total_Sale) AS Revenue,
+                   SUM(Discount_Amount) AS Total_Discounts
+            FROM sales
+            WHERE Product IS NOT NULL
+            GROUP BY Product
+        """, conn)
+    else:
+        product_perf = df.groupby('Product', as_index=False, sort=False, observed=True).agg(
+            Transactions=('Transaction_ID', 'count'),
+            Units_Sold=('Units', 'sum'),
+            Revenue=('Total_Sale', 'sum'),
+            Total_Discounts=('Discount_Amount', 'sum')
+        )
 
-    product_perf.columns = ['Product', 'Transactions', 'Units_Sold', 'Revenue', 'Total_Discounts']
     product_perf['Avg_Transaction'] = product_perf['Revenue'] / product_perf['Transactions']
     product_perf['Discount_%'] = (
                 product_perf['Total_Discounts'] / (product_perf['Revenue'] + product_perf['Total_Discounts']) * 100)
@@ -146,16 +183,26 @@ def analyze_product_performance(df):
     return product_perf
 
 
-def analyze_regional_performance(df):
-    """Analyze performance by region"""
+def analyze_regional_performance(df, conn=None):
+    """Analyze performance by region (aggregated by SQLite when conn is given)"""
+
+    if conn is not None:
+        regional = pd.read_sql_query("""
+            SELECT Region,
+                   COUNT(Transaction_ID) AS Transactions,
+                   SUM(Units) AS Units_Sold,
+                   SUM(Total_Sale) AS Revenue
+            FROM sales
+            WHERE Region IS NOT NULL
+            GROUP BY Region
+        """, conn)
+    else:
+        regional = df.groupby('Region', as_index=False, sort=False, observed=True).agg(
+            Transactions=('Transaction_ID', 'count'),
+            Units_Sold=('Units', 'sum'),
+            Revenue=('Total_Sale', 'sum')
+        )
 
-    regional = df.groupby('Region').agg({
-        'Transaction_ID': 'count',
-        'Units': 'sum',
-        'Total_Sale': 'sum'
-    }).reset_index()
-
-    regional.columns = ['Region', 'Transactions', 'Units_Sold', 'Revenue']
     regional['Avg_Transaction'] = regional['Revenue'] / regional['Transactions']
     regional['Revenue_Share_%'] = (regional['Revenue'] / regional['Revenue'].sum() * 100)
 
@@ -164,16 +211,26 @@ def analyze_regional_performance(df):
     return regional
 
 
-def analyze_sales_rep_performance(df):
-    """Analyze performance by sales representative"""
-
-    rep_perf = df.groupby('Sales_Rep').agg({
-        'Transaction_ID': 'count',
-        'Total_Sale': 'sum',
-        'Customer': 'nunique'
-    }).reset_index()
+def analyze_sales_rep_performance(df, conn=None):
+    """Analyze performance by sales representative (aggregated by SQLite when conn is given)"""
+
+    if conn is not None:
+        rep_perf = pd.read_sql_query("""
+            SELECT Sales_Rep,
+                   COUNT(Transaction_ID) AS Transactions,
+                   SUM(Total_Sale) AS Revenue,
+                   COUNT(DISTINCT Customer) AS Unique_Customers
+            FROM sales
+            WHERE Sales_Rep IS NOT NULL
+            GROUP BY Sales_Rep
+        """, conn)
+    else:
+        rep_perf = df.groupby('Sales_Rep', as_index=False, sort=False, observed=True).agg(
+            Transactions=('Transaction_ID', 'count'),
+            Revenue=('Total_Sale', 'sum'),
+            Unique_Customers=('Customer', 'nunique')
+        )
 
-    rep_perf.columns = ['Sales_Rep', 'Transactions', 'Revenue', 'Unique_Customers']
     rep_perf['Avg_Transaction'] = rep_perf['Revenue'] / rep_perf['Transactions']
     rep_perf['Revenue_per_Customer'] = rep_perf['Revenue'] / rep_perf['Unique_Customers']
 
@@ -182,48 +239,83 @@ def analyze_sales_rep_performance(df):
     return rep_perf
 
 
-def analyze_time_trends(df):
-    """Analyze trends over time"""
-
-    # Daily trends
-    daily = df.groupby('Date').agg({
-        'Transaction_ID': 'count',
-        'Total_Sale': 'sum'
-    }).reset_index()
-    daily.columns = ['Date', 'Transactions', 'Revenue']
-
-    # Weekly trends
-    df['Week'] = df['Date'].dt.to_period('W')
-    weekly = df.groupby('Week').agg({
-        'Transaction_ID': 'count',
-        'Total_Sale': 'sum'
-    }).reset_index()
-    weekly.columns = ['Week', 'Transactions', 'Revenue']
+def analyze_time_trends(df, conn=None):
+    """Analyze trends over time (daily totals aggregated by SQLite when conn is given)"""
+
+    # Daily trends - the only pass over the raw transactions
+    if conn is not None:
+        daily = pd.read_sql_query("""
+            SELECT Date,
+                   COUNT(Transaction_ID) AS Transactions,
+                   SUM(Total_Sale) AS Revenue,
+                   SUM(Units) AS Units
+            FROM sales
+            WHERE Date IS NOT NULL
+            GROUP BY Date
+            ORDER BY Date
+        """, conn, parse_dates=['Date'])
+    else:
+        daily = df.groupby('Date', as_index=False).agg(
+            Transactions=('Transaction_ID', 'count'),
+            Revenue=('Total_Sale', 'sum'),
+            Units=('Units', 'sum')
+        )
+
+    # Weekly and monthly trends roll up the (much smaller) daily totals
+    week = daily['Date'].dt.to_period('W').rename('Week')
+    weekly = daily.groupby(week)[['Transactions', 'Revenue']].sum().reset_index()
     weekly['Week'] = weekly['Week'].astype(str)
 
-    # Monthly trends
-    df['Month'] = df['Date'].dt.to_period('M')
-    monthly = df.groupby('Month').agg({
-        'Transaction_ID': 'count',
-        'Total_Sale': 'sum',
-        'Units': 'sum'
-    }).reset_index()
-    monthly.columns = ['Month', 'Transactions', 'Revenue', 'Units']
+    month = daily['Date'].dt.to_period('M').rename('Month')
+    monthly = daily.groupby(month)[['Transactions', 'Revenue', 'Units']].sum().reset_index()
     monthly['Month'] = monthly['Month'].astype(str)
 
-    return daily, weekly, monthly
+    daily = daily[['Date', 'Transactions', 'Revenue']]
 
+    return daily, weekly, monthly
 
-def identify_top_customers(df, top_n=20):
-    """Identify top customers by revenue"""
 
-    customer_analysis = df.groupby('Customer').agg({
-        'Transaction_ID': 'count',
-        'Total_Sale': 'sum',
-        'Units': 'sum'
-    }).reset_index()
+def identify_top_customers(df, top_n=20, conn=None):
+    """Identify top customers by revenue (ranked by SQLite when conn is given)"""
+
+    if conn is not None:
+        # SQLite sorts and applies the top-N limit, so only top_n rows reach pandas
+        customer_analysis = pd.read_sql_query("""
+            SELECT Customer,
+                   COUNT(Transaction_ID) AS Transactions,
+                   SUM(Total_Sale) AS Total_Revenue,
+                   SUM(Units) AS Total_Units
+            FROM sales
+            WHERE Customer IS NOT NULL
+            GROUP BY Customer
+            ORDER BY Total_Revenue DESC
+            LIMIT ?
+        """, conn, params=(top_n,))
+    else:
+        # There can be many customers, so skip groupby's per-group machinery and
+        # total each metric with a single bincount over the category codes
+        customers = df['Customer'].astype('category')
+        codes = customers.cat.codes.to_numpy()
+        has_customer = codes >= 0  # -1 marks a missing customer
+        codes = codes[has_customer]
+        n_customers = len(customers.cat.categories)
+
+        def total_per_customer(values):
+            weights = np.nan_to_num(np.asarray(values, dtype=float)[has_customer])
+            return np.bincount(codes, weights=weights, minlength=n_customers)
+
+        total_units = total_per_customer(df['Units'])
+        if pd.api.types.is_integer_dtype(df['Units']):
+            total_units = total_units.astype(np.int64)
+
+        customer_analysis = pd.DataFrame({
+            'Customer': customers.cat.categories,
+            'Transactions': total_per_customer(df['Transaction_ID'].notna()).astype(np.int64),
+            'Total_Revenue': total_per_customer(df['Total_Sale']),
+            'Total_Units': total_units
+        })
+        customer_analysis = customer_analysis[np.bincount(codes, minlength=n_customers) > 0]
 
-    customer_analysis.columns = ['Customer', 'Transactions', 'Total_Revenue', 'Total_Units']
     customer_analysis['Avg_Transaction'] = customer_analysis['Total_Revenue'] / customer_analysis['Transactions']
 
     customer_analysis = customer_analysis.sort_values('Total_Revenue', ascending=False).head(top_n)
@@ -231,8 +323,51 @@ def identify_top_customers(df, top_n=20):
     return customer_analysis
 
 
-def generate_dashboard(df, output_file='sales_dashboard.xlsx'):
-    """Generate comprehensive sales dashboard"""
+def write_sheets(output_file, sheets):
+    """Stream (sheet_name, DataFrame) pairs into a new workbook using openpyxl's write-only mode"""
+
+    # Write-only mode streams each row to disk instead of keeping a cell object
+    # per value, and skips pandas' cell-by-cell Excel formatter entirely
+    wb = openpyxl.Workbook(write_only=True)
+
+    for sheet_name, frame in sheets:
+        ws = wb.create_sheet(sheet_name)
+
+        header = []
+        for column in frame.columns:
+            cell = WriteOnlyCell(ws, value=str(column))
+            cell.font = Font(bold=True)
+            header.append(cell)
+        ws.append(header)
+
+        # Missing values become empty cells, as with to_excel
+        values = frame.astype(object).where(frame.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            ws.append(row)
+
+    wb.save(output_file)
+
+
+def load_sales_to_sqlite(df, conn):
+    """Copy sales data into a SQLite 'sales' table, indexed on the dashboard's grouping columns"""
+
+    df.to_sql('sales', conn, if_exists='replace', index=False, chunksize=5000)
+    for column in ('Product', 'Region', 'Sales_Rep', 'Customer', 'Date'):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_sales_{column} ON sales({column})")
+    conn.execute("ANALYZE")
+    print(f"✓ Loaded {len(df)} transactions into SQLite")
+
+
+def generate_dashboard(df, output_file='sales_dashboard.xlsx', conn=None):
+    """
+    Generate comprehensive sales dashboard
+
+    Args:
+        df: Sales DataFrame (used for the executive summary and key insights)
+        output_file: Name of the dashboard workbook to write
+        conn: Optional SQLite connection holding the same data in a 'sales' table
+              (see load_sales_to_sqlite); the heavy aggregations then run in SQL
+    """
 
     print("\n" + "=" * 60)
     print("GENERATING SALES DASHBOARD")
@@ -244,47 +379,37 @@ def generate_dashboard(df, output_file='sales_dashboard.xlsx'):
     exec_summary = generate_executive_summary(df)
     print("  ✓ Executive summary")
 
-    product_perf = analyze_product_performance(df)
+    product_perf = analyze_product_performance(df, conn)
     print("  ✓ Product performance")
 
-    regional = analyze_regional_performance(df)
+    regional = analyze_regional_performance(df, conn)
     print("  ✓ Regional analysis")
 
-    rep_perf = analyze_sales_rep_performance(df)
+    rep_perf = analyze_sales_rep_performance(df, conn)
     print("  ✓ Sales rep performance")
 
-    daily, weekly, monthly = analyze_time_trends(df)
+    daily, weekly, monthly = analyze_time_trends(df, conn)
     print("  ✓ Time trends")
 
-    top_customers = identify_top_customers(df)
+    top_customers = identify_top_customers(df, conn=conn)
     print("  ✓ Customer analysis")
 
     # Create dashboard Excel file
     print(f"\n💾 Writing dashboard to '{output_file}'...")
 
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+    sheets = [
+        ('Executive_Summary', exec_summary),
+        ('Product_Performance', product_perf),
+        ('Regional_Analysis', regional),
+        ('Sales_Rep_Performance', rep_perf),
+        ('Top_Customers', top_customers),
+        ('Monthly_Trends', monthly),
+        ('Weekly_Trends', weekly),
+        ('Daily_Trends', daily)
+    ]
+    write_sheets(output_file, sheets)
 
-        # Sheet 1: Executive Summary
-        exec_summary.to_excel(writer, sheet_name='Executive_Summary', index=False)
-
-        # Sheet 2: Product Performance
-        product_perf.to_excel(writer, sheet_name='Product_Performance', index=False)
-
-        # Sheet 3: Regional Analysis
-        regional.to_excel(writer, sheet_name='Regional_Analysis', index=False)
-
-        # Sheet 4: Sales Rep Performance
-        rep_perf.to_excel(writer, sheet_name='Sales_Rep_Performance', index=False)
-
-        # Sheet 5: Top Customers
-        top_customers.to_excel(writer, sheet_name='Top_Customers', index=False)
-
-        # Sheet 6-8: Time Trends
-        monthly.to_excel(writer, sheet_name='Monthly_Trends', index=False)
-        weekly.to_excel(writer, sheet_name='Weekly_Trends', index=False)
-        daily.to_excel(writer, sheet_name='Daily_Trends', index=False)
-
-    print(f"✓ Dashboard saved with 8 sheets")
+    print(f"✓ Dashboard saved with {len(sheets)} sheets")
 
     # Print key insights
     print("\n" + "=" * 60)
@@ -297,12 +422,16 @@ def generate_dashboard(df, output_file='sales_dashboard.xlsx'):
     print(f"📦 Total Units Sold: {df['Units'].sum():,}")
 
     print(f"\n🏆 Top 3 Products by Revenue:")
-    for i, row in product_perf.head(3).iterrows():
-        print(f"   {i + 1}. {row['Product']}: ${row['Revenue']:,.2f} ({row['Revenue_Share_%']:.1f}%)")
+    top_products = product_perf.head(3)
+    for rank, (product, revenue, share) in enumerate(
+            zip(top_products['Product'], top_products['Revenue'], top_products['Revenue_Share_%']), start=1):
+        print(f"   {rank}. {product}: ${revenue:,.2f} ({share:.1f}%)")
 
     print(f"\n🌍 Top 3 Regions by Revenue:")
-    for i, row in regional.head(3).iterrows():
-        print(f"   {i + 1}. {row['Region']}: ${row['Revenue']:,.2f} ({row['Revenue_Share_%']:.1f}%)")
+    top_regions = regional.head(3)
+    for rank, (region, revenue, share) in enumerate(
+            zip(top_regions['Region'], top_regions['Revenue'], top_regions['Revenue_Share_%']), start=1):
+        print(f"   {rank}. {region}: ${revenue:,.2f} ({share:.1f}%)")
 
     print(f"\n⭐ Top Sales Rep:")
     top_rep = rep_perf.iloc[0]
@@ -316,11 +445,25 @@ def main():
     print("AUTOMATED SALES DASHBOARD GENERATOR")
     print("=" * 60)
 
+    # Dashboard was built from this exact raw data file -> re-running would reproduce it
+    if is_up_to_date(['sales_dashboard.xlsx'], ['raw_sales_data.xlsx']):
+        print("\n✓ 'sales_dashboard.xlsx' is up to date with raw_sales_data.xlsx - nothing to do")
+        print("  (delete it to force a rebuild)")
+        return
+
     # Load data
     df = load_sales_data()
 
     # Generate dashboard
     generate_dashboard(df)
+    if Path('raw_sales_data.xlsx').exists():
+        record_inputs(['sales_dashboard.xlsx'], ['raw_sales_data.xlsx'])
+
+    # Option 2: Let SQLite do the heavy aggregation (useful for very large files)
+    # conn = sqlite3.connect('sales.db')
+    # load_sales_to_sqlite(df, conn)
+    # generate_dashboard(df, conn=conn)
+    # conn.close()
 
     print("\n" + "=" * 60)
     print("✓ DASHBOARD GENERATION COMPLETE")
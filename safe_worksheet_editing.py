@@ -2,16 +2,33 @@
 Methods to Edit a Single Worksheet Without Affecting Others
 """
 
+import warnings
+from itertools import chain
+
 import pandas as pd
 import openpyxl
-from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.xml import LXML
+
+# Optional fast path: calamine is a Rust .xlsx reader
+try:
+    import python_calamine  # noqa: F401
+    # read_excel only accepts engine='calamine' from pandas 2.2 on
+    pandas_version = tuple(int(x) for x in pd.__version__.split('.')[:2])
+    EXCEL_ENGINE = 'calamine' if pandas_version >= (2, 2) else None
+except ImportError:
+    EXCEL_ENGINE = None  # let pandas pick its default (openpyxl)
+
+# Without lxml openpyxl falls back to the much slower and hungrier stdlib XML parser
+if not LXML:
+    warnings.warn("lxml is not installed: openpyxl will load and save workbooks "
+                  "slower and with more memory (pip install lxml)")
 
 
 # ============================================================================
 # METHOD 1: Using openpyxl (RECOMMENDED - Most Control)
 # ============================================================================
 
-def edit_worksheet_openpyxl(file_path, sheet_name, modifications):
+def edit_worksheet_openpyxl(file_path, sheet_name, modifications, keep_links=True):
     """
     Edit a specific worksheet using openpyxl.
     This preserves ALL other sheets, formatting, formulas, etc.
@@ -20,9 +37,11 @@ def edit_worksheet_openpyxl(file_path, sheet_name, modifications):
         file_path: Path to Excel file
         sheet_name: Name of sheet to edit
         modifications: Function that takes worksheet and modifies it
+        keep_links: Load and keep links to external workbooks. False loads faster
+                    but the saved file no longer has those links.
     """
     # Load the entire workbook
-    workbook = openpyxl.load_workbook(file_path)
+    workbook = openpyxl.load_workbook(file_path, keep_links=keep_links)
 
     # Get the specific worksheet
     worksheet = workbook[sheet_name]
@@ -39,12 +58,11 @@ def edit_worksheet_openpyxl(file_path, sheet_name, modifications):
 def example_openpyxl_modifications():
     """Example: Update specific cells in a worksheet"""
 
-    # Create a sample workbook with multiple sheets
-    wb = openpyxl.Workbook()
+    # Create a sample workbook with multiple sheets (write-only: rows stream to disk)
+    wb = openpyxl.Workbook(write_only=True)
 
     # Sheet 1: Sales Data
-    ws1 = wb.active
-    ws1.title = "Sales"
+    ws1 = wb.create_sheet("Sales")
     ws1.append(["Product", "Q1", "Q2", "Q3", "Q4"])
     ws1.append(["Widget A", 100, 150, 200, 175])
     ws1.append(["Widget B", 80, 90, 110, 95])
@@ -92,15 +110,11 @@ def edit_worksheet_pandas_safe(file_path, sheet_name, dataframe_modifier):
         dataframe_modifier: Function that takes a DataFrame and returns modified DataFrame
     """
     # Read the specific sheet into a DataFrame
-    df = pd.read_excel(file_path, sheet_name=sheet_name)
+    df = pd.read_excel(file_path, sheet_name=sheet_name, engine=EXCEL_ENGINE)
 
     # Modify the DataFrame
     modified_df = dataframe_modifier(df)
 
-    # Read ALL sheet names
-    with pd.ExcelFile(file_path) as xls:
-        sheet_names = xls.sheet_names
-
     # Write back using ExcelWriter in 'openpyxl' mode
     with pd.ExcelWriter(file_path, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
         modified_df.to_excel(writer, sheet_name=sheet_name, index=False)
@@ -146,37 +160,44 @@ def example_pandas_modifications():
 
 
 # ============================================================================
-# METHOD 3: Read All, Modify One, Write All (Simple but less efficient)
+# METHOD 3: Read One, Modify One, Replace One (Simple, warns on missing sheet)
 # ============================================================================
 
 def edit_worksheet_read_all(file_path, sheet_name, dataframe_modifier):
     """
-    Read all sheets, modify one, write all back.
-    Simple but loses some formatting.
+    Read one sheet, modify it, and replace just that sheet in the file.
+    Simple but loses the formatting of the edited sheet.
+
+    Only the target sheet is read and rewritten, so the cost follows the size
+    of that sheet rather than the whole workbook. Unlike Method 2 a missing
+    sheet is reported instead of raising.
     """
-    # Read ALL sheets into a dictionary
-    all_sheets = pd.read_excel(file_path, sheet_name=None)
+    # Check the sheet exists (read-only mode only parses the workbook index)
+    workbook = openpyxl.load_workbook(file_path, read_only=True)
+    sheet_names = workbook.sheetnames
+    workbook.close()
 
-    # Modify the specific sheet
-    if sheet_name in all_sheets:
-        all_sheets[sheet_name] = dataframe_modifier(all_sheets[sheet_name])
-    else:
+    if sheet_name not in sheet_names:
         print(f"Warning: Sheet '{sheet_name}' not found!")
         return
 
-    # Write all sheets back
-    with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-        for sheet, df in all_sheets.items():
-            df.to_excel(writer, sheet_name=sheet, index=False)
+    # Read and modify the specific sheet
+    df = pd.read_excel(file_path, sheet_name=sheet_name, engine=EXCEL_ENGINE)
+    modified_df = dataframe_modifier(df)
+
+    # Replace only that sheet; the others are left as they are in the file
+    with pd.ExcelWriter(file_path, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
+        modified_df.to_excel(writer, sheet_name=sheet_name, index=False)
 
-    print(f"✓ Updated '{sheet_name}' (rewrote all sheets)")
+    print(f"✓ Updated '{sheet_name}' (replaced one sheet)")
 
 
 # ============================================================================
 # METHOD 4: Advanced - Replace DataFrame in existing worksheet with openpyxl
 # ============================================================================
 
-def replace_worksheet_data_openpyxl(file_path, sheet_name, new_df, start_row=1, start_col=1):
+def replace_worksheet_data_openpyxl(file_path, sheet_name, new_df, start_row=1, start_col=1,
+                                    keep_links=True, replace_sheet=False):
     """
     Replace data in a worksheet with a DataFrame while preserving workbook structure.
     Great for updating data while keeping formatting in other cells.
@@ -187,17 +208,39 @@ def replace_worksheet_data_openpyxl(file_path, sheet_name, new_df, start_row=1,
         new_df: New DataFrame to write
         start_row: Starting row (1-indexed)
         start_col: Starting column (1-indexed)
+        keep_links: Load and keep links to external workbooks. False loads faster
+                    but the saved file no longer has those links.
+        replace_sheet: Recreate the sheet empty at the same position and fill it
+                       row by row - much faster for big frames, but the sheet's own
+                       formatting, widths, freeze panes, charts etc. are lost.
+                       Only valid when writing from A1.
     """
-    wb = openpyxl.load_workbook(file_path)
-    ws = wb[sheet_name]
+    if replace_sheet and (start_row, start_col) != (1, 1):
+        raise ValueError("replace_sheet=True always writes from A1; "
+                         "leave start_row/start_col at 1")
+
+    wb = openpyxl.load_workbook(file_path, keep_links=keep_links)
+    # Header, then the data as one object array -> plain Python values per row,
+    # converted in a single pass instead of value by value
+    rows = chain([tuple(new_df.columns)], map(tuple, new_df.to_numpy(dtype=object)))
+
+    if replace_sheet:
+        # Fresh sheet in the same slot -> ws.append, no per-cell lookups
+        position = wb.sheetnames.index(sheet_name)
+        del wb[sheet_name]
+        ws = wb.create_sheet(sheet_name, position)
+        for row in rows:
+            ws.append(row)
+    else:
+        ws = wb[sheet_name]
 
-    # Clear existing data in the range (optional)
-    # ws.delete_rows(start_row, ws.max_row)
+        # Clear existing data in the range (optional)
+        # ws.delete_rows(start_row, ws.max_row)
 
-    # Write DataFrame to worksheet
-    for r_idx, row in enumerate(dataframe_to_rows(new_df, index=False, header=True), start=start_row):
-        for c_idx, value in enumerate(row, start=start_col):
-            ws.cell(row=r_idx, column=c_idx, value=value)
+        # Write DataFrame to worksheet
+        for r_idx, row in enumerate(rows, start=start_row):
+            for c_idx, value in enumerate(row, start=start_col):
+                ws.cell(row=r_idx, column=c_idx, value=value)
 
     wb.save(file_path)
     wb.close()
@@ -211,12 +254,12 @@ def replace_worksheet_data_openpyxl(file_path, sheet_name, new_df, start_row=1,
 def practical_example():
     """Real-world scenario: Update monthly sales without touching other sheets"""
 
-    # Create a workbook with multiple sheets (simulating an existing report)
-    wb = openpyxl.Workbook()
+    # Create a workbook with multiple sheets (simulating an existing report).
+    # Write-only mode streams rows to disk; fine here as the file is only created once.
+    wb = openpyxl.Workbook(write_only=True)
 
     # Summary sheet (should NOT be touched)
-    ws_summary = wb.active
-    ws_summary.title = "Summary"
+    ws_summary = wb.create_sheet("Summary")
     ws_summary.append(["Metric", "Value"])
     ws_summary.append(["Total Sales", "=SUM(Monthly_Data!B:B)"])
     ws_summary.append(["Report Date", "2024-12-17"])
@@ -283,10 +326,10 @@ def print_recommendations():
        • When other sheets must stay untouched
        • Balanced approach for data analysts
 
-    🔄 METHOD 3 (Read All, Write All) - BEST FOR:
-       • Simple files with few sheets
-       • When formatting doesn't matter
-       • Quick scripts where efficiency isn't critical
+    🔄 METHOD 3 (Read One, Replace One) - BEST FOR:
+       • Simple scripts that should skip a missing sheet, not fail
+       • When the edited sheet's formatting doesn't matter
+       • Large workbooks: only the target sheet is read and rewritten
 
     🎯 METHOD 4 (DataFrame to openpyxl) - BEST FOR:
        • Updating a data range within a formatted sheet